@@ -0,0 +1,195 @@
+# price_scraper/bulk_import.py
+
+import os
+import re
+import csv
+import argparse
+import logging
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from urllib.parse import urlsplit, urlunsplit
+import shutil
+import requests
+from catalog import INPUT_FILE, backup_catalog
+from extractors import extract_product, is_supported, normalize_url
+from scraper import HEADERS
+
+PROBE_TIMEOUT = 15
+PROBE_WORKERS = 16
+
+HREF_RE = re.compile(r'<a\s[^>]*href=["\']([^"\']+)["\']', re.IGNORECASE)
+URL_COLUMNS = ('url', 'link', 'product url', 'href')
+CAR_COLUMNS = ('car', 'car model', 'section', 'model')
+
+_probe_local = threading.local()
+
+# Add a missing scheme, lower-case scheme and host, and drop query and fragment; the path is kept as written
+def clean_url(url):
+    url = url.strip()
+    if not url.lower().startswith(("http://", "https://")):
+        url = "https://" + url
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, "", ""))
+
+def _rows_from_csv(f, default_car):
+    rows = list(csv.reader(f))
+    if not rows:
+        return
+    header = [cell.strip().lower() for cell in rows[0]]
+    url_col = next((header.index(name) for name in URL_COLUMNS if name in header), None)
+    car_col = next((header.index(name) for name in CAR_COLUMNS if name in header), None)
+    if url_col is None:
+        # No header: take the first cell in each row that looks like a link, and the first other cell as the car
+        for row in rows:
+            url = next((cell for cell in row if "://" in cell or ".com/" in cell), None)
+            if url:
+                car = next((cell.strip() for cell in row if cell is not url and cell.strip()), "")
+                yield car or default_car, url
+        return
+    for row in rows[1:]:
+        if len(row) > url_col and row[url_col].strip():
+            car = row[car_col].strip() if car_col is not None and len(row) > car_col else ""
+            yield car or default_car, row[url_col]
+
+def _rows_from_text(f, default_car):
+    for line in f:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        if '|' in line:
+            car, url = line.split('|', 1)
+            yield car.strip() or default_car, url
+        else:
+            yield default_car, line
+
+# Read (car, url) pairs from a CSV, a plain/"Car|URL" text list or an exported bookmarks HTML file
+def read_links(path, default_car=""):
+    with open(path, 'r', encoding='utf-8', errors='replace', newline='') as f:
+        if path.lower().endswith(('.html', '.htm')):
+            return [(default_car, url) for url in HREF_RE.findall(f.read())]
+        if path.lower().endswith('.csv'):
+            return list(_rows_from_csv(f, default_car))
+        return list(_rows_from_text(f, default_car))
+
+# Every line of the catalog, comments and blank lines included, so a rewrite keeps them
+def load_catalog(path=INPUT_FILE):
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r') as f:
+        return [line.rstrip('\n') for line in f]
+
+# One session per probe thread, so each worker reuses its connections to the site
+def _probe_session():
+    session = getattr(_probe_local, 'session', None)
+    if session is None:
+        session = _probe_local.session = requests.Session()
+    return session
+
+# Fetch a page and check it has usable product JSON-LD; returns a rejection reason or None
+def probe_link(url):
+    try:
+        response = _probe_session().get(url, headers=HEADERS, timeout=PROBE_TIMEOUT)
+    except requests.RequestException as e:
+        return f"request failed: {e}"
+    if response.status_code != 200:
+        return f"HTTP {response.status_code}"
+    try:
+        record = extract_product(response.content, url, "")
+    except Exception as e:
+        return f"unreadable page: {e}"
+    if record is None:
+        return "no JSON-LD product data"
+    if not record.sku or record.sku == "N/A":
+        return "no SKU on page"
+    return None
+
+# Write the whole catalog to a temp file and swap it in, so readers never see a partial file
+def write_catalog(lines, path=INPUT_FILE):
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            for line in lines:
+                f.write(line + "\n")
+        # mkstemp creates the file as 0600; keep the permissions the catalog already had
+        if os.path.exists(path):
+            shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def write_rejection_report(rejected):
+    report_path = f"import_rejections_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+    with open(report_path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Car', 'URL', 'Reason'])
+        writer.writerows(rejected)
+    return report_path
+
+# Normalize, de-duplicate, validate in parallel and commit the good links in one write
+def import_links(paths, default_car="", catalog_path=INPUT_FILE, validate=True, workers=PROBE_WORKERS):
+    catalog = load_catalog(catalog_path)
+    known = {normalize_url(line.split('|', 1)[1]) for line in catalog if '|' in line}
+
+    candidates = []
+    rejected = []
+    for path in paths:
+        for car, url in read_links(path, default_car):
+            url = url.strip()
+            if not url:
+                continue
+            if not car:
+                rejected.append((car, url, "no car model"))
+                continue
+            cleaned = clean_url(url)
+            if not is_supported(cleaned):
+                rejected.append((car, url, "unsupported site"))
+                continue
+            key = normalize_url(cleaned)
+            if key in known:
+                rejected.append((car, url, "duplicate"))
+                continue
+            known.add(key)
+            candidates.append((car, cleaned))
+
+    if validate and candidates:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            reasons = list(pool.map(probe_link, [url for _, url in candidates]))
+    else:
+        reasons = [None] * len(candidates)
+
+    accepted = []
+    for (car, url), reason in zip(candidates, reasons):
+        if reason is None:
+            accepted.append((car, url))
+        else:
+            rejected.append((car, url, reason))
+
+    if accepted:
+        backup_catalog(catalog_path)
+        write_catalog(catalog + [f"{car}|{url}" for car, url in accepted], catalog_path)
+    logging.info(f"📥 Bulk import: {len(accepted)} added, {len(rejected)} rejected")
+
+    report_path = write_rejection_report(rejected) if rejected else None
+    return accepted, rejected, report_path
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import product links into input_links.txt.")
+    parser.add_argument('files', nargs='+', help="CSV, text or bookmarks HTML files")
+    parser.add_argument('--car', default="", help="car model for links that don't name one (e.g. E92 M3)")
+    parser.add_argument('--no-validate', action='store_true', help="skip fetching each page before adding it")
+    parser.add_argument('--workers', type=int, default=PROBE_WORKERS, help="pages to probe at once")
+    args = parser.parse_args()
+
+    accepted, rejected, report_path = import_links(args.files, args.car, validate=not args.no_validate,
+                                                   workers=args.workers)
+    print(f"✅ Added {len(accepted)} links to {INPUT_FILE}.")
+    if rejected:
+        print(f"⚠️ Rejected {len(rejected)} links — see {report_path}")
+
+if __name__ == '__main__':
+    main()
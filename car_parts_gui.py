@@ -3,6 +3,7 @@ from tkinter import ttk, messagebox
 import pandas as pd
 import os
 import platform
+from search_view import DebouncedSearch, PagedResults, build_search_index, find_matches
 
 DATABASE_FILE = 'euro_parts_database.xlsx'
 
@@ -18,6 +19,11 @@ class EuroPartsApp(tk.Tk):
         self.configure_theme()
 
         self.parts_data = self.load_database()
+        self.search_index = build_search_index(self.parts_data)
+
+        # Search is debounced and only the visible page of matches is rendered
+        self.results = PagedResults()
+        self.search_debounce = DebouncedSearch(self, self.search_part)
 
         self.create_widgets()
 
@@ -73,7 +79,7 @@ class EuroPartsApp(tk.Tk):
         self.search_var = tk.StringVar()
         self.search_entry = ttk.Entry(frame_top, textvariable=self.search_var, width=35)
         self.search_entry.grid(row=4, column=1, padx=8)
-        self.search_var.trace("w", self.search_part)
+        self.search_var.trace("w", self.search_debounce.schedule)
 
         # Buttons
         frame_buttons = ttk.Frame(self)
@@ -85,8 +91,17 @@ class EuroPartsApp(tk.Tk):
         # Output Text
         default_font = ("Segoe UI", 11)
         self.option_add('*Font', default_font)
+        self.output_text = tk.Text(self, width=110, height=20)
         self.output_text.pack(pady=20)
 
+        # Result paging
+        frame_pager = ttk.Frame(self)
+        frame_pager.pack()
+        ttk.Button(frame_pager, text="◀ Prev", command=self.prev_results_page).grid(row=0, column=0, padx=12)
+        self.result_count = ttk.Label(frame_pager, text="")
+        self.result_count.grid(row=0, column=1, padx=12)
+        ttk.Button(frame_pager, text="Next ▶", command=self.next_results_page).grid(row=0, column=2, padx=12)
+
     def get_unique_cars(self):
         return sorted(self.parts_data['Car'].dropna().unique().tolist())
 
@@ -107,15 +122,32 @@ class EuroPartsApp(tk.Tk):
             self.part_var.set(first_match.get('Part Name', ''))
 
     def search_part(self, *args):
-        query = self.search_var.get().lower()
-        matches = self.parts_data[self.parts_data.apply(lambda row: query in str(row['Part Name']).lower() or query in str(row['Part Number']).lower(), axis=1)]
+        query = self.search_var.get()
+        self.results.set_matches(find_matches(self.parts_data, self.search_index, query))
+        self.render_results_page()
 
+    def render_results_page(self):
         self.output_text.delete('1.0', tk.END)
-        if not matches.empty:
-            for _, row in matches.iterrows():
-                self.output_text.insert(tk.END, f"Car: {row['Car']} | Part: {row['Part Name']} | Part #: {row['Part Number']} | URL: {row['URL']}\n")
-        else:
+        if self.results.total == 0:
             self.output_text.insert(tk.END, "No matching part found.\n")
+            self.result_count.config(text="0 matches")
+            return
+
+        page = self.results.visible()
+        lines = [
+            f"Car: {car} | Part: {name} | Part #: {number} | URL: {url}"
+            for car, name, number, url in zip(page['Car'], page['Part Name'], page['Part Number'], page['URL'])
+        ]
+        self.output_text.insert(tk.END, "\n".join(lines) + "\n")
+        self.result_count.config(text=self.results.summary())
+
+    def next_results_page(self):
+        if self.results.next_page():
+            self.render_results_page()
+
+    def prev_results_page(self):
+        if self.results.prev_page():
+            self.render_results_page()
 
     def add_part(self):
         car = self.car_var.get()
@@ -145,6 +177,7 @@ class EuroPartsApp(tk.Tk):
 
         self.parts_data = pd.concat([self.parts_data, new_entry], ignore_index=True)
         self.parts_data.to_excel(DATABASE_FILE, index=False)
+        self.search_index = build_search_index(self.parts_data)
 
         messagebox.showinfo("Success", "Part added successfully.")
         self.clear_inputs()
@@ -0,0 +1,20 @@
+# price_scraper/catalog.py
+
+import os
+import shutil
+import logging
+from datetime import datetime
+
+INPUT_FILE = 'input_links.txt'
+
+# Copy a catalog file into backups/ before it is rewritten
+def backup_catalog(path=INPUT_FILE, backup_dir="backups"):
+    if not os.path.exists(path):
+        return None
+    os.makedirs(backup_dir, exist_ok=True)
+    stem, ext = os.path.splitext(os.path.basename(path))
+    now = datetime.now().strftime("%Y%m%d_%H%M%S")
+    backup_name = os.path.join(backup_dir, f"{stem}_backup_{now}{ext}")
+    shutil.copy(path, backup_name)
+    logging.info(f"🛡️ Backup created: {backup_name}")
+    return backup_name
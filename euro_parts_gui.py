@@ -4,6 +4,7 @@ import pandas as pd
 import os
 import webbrowser
 from datetime import datetime
+from search_view import DebouncedSearch, PagedResults, build_search_index, find_matches
 
 # Initialize
 ctk.set_appearance_mode("System")
@@ -15,6 +16,7 @@ if not os.path.exists(DB_FILE):
     df.to_excel(DB_FILE, index=False)
 else:
     df = pd.read_excel(DB_FILE)
+SEARCH_INDEX = build_search_index(df)
 
 # Load car types from input_links.txt (unique, sorted)
 CAR_LIST = []
@@ -43,6 +45,10 @@ class EuroPartsDatabase(ctk.CTk):
         self.full_car_list = CAR_LIST
         self.filtered_car_list = CAR_LIST.copy()
 
+        # Search is debounced and only the visible page of matches is rendered
+        self.results = PagedResults()
+        self.search_debounce = DebouncedSearch(self, self.search_autofill)
+
         self.create_widgets()
 
     def create_widgets(self):
@@ -81,11 +87,18 @@ class EuroPartsDatabase(ctk.CTk):
         ctk.CTkLabel(self, text="Search Part Name or Number:").pack(pady=(20, 0))
         self.search_entry = ctk.CTkEntry(self, textvariable=self.search_var, width=400)
         self.search_entry.pack(**padding)
-        self.search_entry.bind("<KeyRelease>", self.search_autofill)
+        self.search_entry.bind("<KeyRelease>", self.search_debounce.schedule)
 
         self.result_text = ctk.CTkTextbox(self, width=800, height=250)
         self.result_text.pack(**padding)
 
+        pager_frame = ctk.CTkFrame(self)
+        pager_frame.pack(pady=(0, 10))
+        ctk.CTkButton(pager_frame, text="◀ Prev", width=80, command=self.prev_results_page).grid(row=0, column=0, padx=10)
+        self.result_count = ctk.CTkLabel(pager_frame, text="")
+        self.result_count.grid(row=0, column=1, padx=10)
+        ctk.CTkButton(pager_frame, text="Next ▶", width=80, command=self.next_results_page).grid(row=0, column=2, padx=10)
+
     def filter_cars(self, event=None):
         typed = self.car_var.get().lower()
         matches = [c for c in self.full_car_list if typed in c.lower()]
@@ -124,9 +137,10 @@ class EuroPartsDatabase(ctk.CTk):
             "Price": ""
         }
 
-        global df
+        global df, SEARCH_INDEX
         df = pd.concat([df, pd.DataFrame([new_row])], ignore_index=True)
         df.to_excel(DB_FILE, index=False)
+        SEARCH_INDEX = build_search_index(df)
 
         # Instead of a popup, show confirmation in the text box
         self.result_text.insert("end", "Part Injection Successful\n")
@@ -138,23 +152,35 @@ class EuroPartsDatabase(ctk.CTk):
         webbrowser.open(DB_FILE)
 
     def search_autofill(self, event=None):
-        query = self.search_var.get().lower()
-        matches = df[
-            df["Part Name"].str.lower().str.contains(query) |
-            df["Part Number"].str.lower().str.contains(query)
-        ]
-
+        query = self.search_var.get()
+        matches = find_matches(df, SEARCH_INDEX, query)
+        self.results.set_matches(matches)
+        self.render_results_page()
+        if len(matches) == 1:
+            self.display_price_stats(matches.iloc[0]["Part Name"])
+
+    def render_results_page(self):
         self.result_text.delete("1.0", "end")
-        if matches.empty:
+        if self.results.total == 0:
             self.result_text.insert("end", "No part found.")
-        else:
-            for _, row in matches.iterrows():
-                self.result_text.insert(
-                    "end",
-                    f"{row['Car']} | {row['Part Name']} | {row['Part Number']} | ${row['Price']}\n"
-                )
-            if len(matches) == 1:
-                self.display_price_stats(matches.iloc[0]["Part Name"])
+            self.result_count.configure(text="0 matches")
+            return
+
+        page = self.results.visible()
+        lines = [
+            f"{car} | {name} | {number} | ${price}"
+            for car, name, number, price in zip(page["Car"], page["Part Name"], page["Part Number"], page["Price"])
+        ]
+        self.result_text.insert("end", "\n".join(lines) + "\n")
+        self.result_count.configure(text=self.results.summary())
+
+    def next_results_page(self):
+        if self.results.next_page():
+            self.render_results_page()
+
+    def prev_results_page(self):
+        if self.results.prev_page():
+            self.render_results_page()
 
     def display_price_stats(self, part_name):
         prices = df[df["Part Name"] == part_name]["Price"].dropna().astype(float)
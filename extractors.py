@@ -0,0 +1,248 @@
+# price_scraper/extractors.py
+
+import copy
+import json
+import re
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+from lxml import etree, html
+from records import ProductRecord
+
+# Compiled once at import so every page reuses them
+JSON_LD_XPATH = etree.XPath('//script[@type="application/ld+json"]/text()')
+JSON_LD_RE = re.compile(
+    rb'<script[^>]*type=["\']application/ld\+json["\'][^>]*>(.*?)</script>',
+    re.IGNORECASE | re.DOTALL
+)
+
+# Listing-page product tiles: any link to a product page, the price text and a part number label
+PRODUCT_LINK_XPATH = etree.XPath('//a[contains(@href, "/products/")]')
+TILE_LINK_XPATH = etree.XPath('.//a[contains(@href, "/products/")]')
+TILE_PRICE_XPATH = etree.XPath('.//*[contains(translate(@class, "PRICE", "price"), "price")]')
+STRUCK_PRICE_XPATH = etree.XPath('.//del | .//s | .//strike')
+PRICE_RE = re.compile(r'\$\s*([0-9][0-9,]*\.[0-9]{2})')
+SKU_RE = re.compile(r'(?:FCP\s*Euro\s*#|SKU|MFG\s*#|Part\s*#)\s*:?\s*([A-Za-z0-9][A-Za-z0-9.\-]*)', re.IGNORECASE)
+OLD_PRICE_CLASS_RE = re.compile(
+    r'(?:was|old|original|strike|compare|msrp|list)[-_]*price|price[-_]*(?:was|old|original|strike|compare|msrp|list)',
+    re.IGNORECASE
+)
+SKU_ATTRIBUTES = ('data-sku', 'data-product-sku', 'data-part-number')
+MAX_TILE_DEPTH = 6
+
+_REGISTRY = {}
+
+# Find the Product object in a JSON-LD payload (plain object, list or @graph)
+def _find_product(data):
+    if isinstance(data, list):
+        for item in data:
+            found = _find_product(item)
+            if found is not None:
+                return found
+        return None
+    if not isinstance(data, dict):
+        return None
+    if '@graph' in data:
+        return _find_product(data['@graph'])
+    item_type = data.get('@type')
+    if item_type == 'Product' or (isinstance(item_type, list) and 'Product' in item_type) or 'offers' in data:
+        return data
+    return None
+
+# Every Product object in a JSON-LD payload, including ItemList entries on listing pages
+def _iter_products(data):
+    if isinstance(data, list):
+        for item in data:
+            yield from _iter_products(item)
+        return
+    if not isinstance(data, dict):
+        return
+    item_type = data.get('@type')
+    if item_type == 'Product' or (isinstance(item_type, list) and 'Product' in item_type):
+        yield data
+    for key in ('@graph', 'itemListElement', 'item'):
+        if key in data:
+            yield from _iter_products(data[key])
+
+def _load_blocks(blocks):
+    first = None
+    for block in blocks:
+        try:
+            data = json.loads(block)
+        except ValueError:
+            continue
+        if first is None:
+            first = data
+        product = _find_product(data)
+        if product is not None:
+            return product
+    # Old behaviour: fall back to the first JSON-LD block on the page
+    return first if isinstance(first, dict) else None
+
+# Base extractor: parse the page and read the Product JSON-LD
+class Extractor:
+    hosts = ()
+
+    # Cheap scan of the raw bytes; return the product dict or None to fall back to parse()
+    def fast_path(self, content):
+        return None
+
+    def parse(self, content):
+        tree = html.fromstring(content)
+        return _load_blocks(JSON_LD_XPATH(tree))
+
+    def json_ld_blocks(self, content):
+        return JSON_LD_XPATH(html.fromstring(content))
+
+    def extract(self, content, url, product_name):
+        data = self.fast_path(content)
+        if data is None:
+            data = self.parse(content)
+        if data is None:
+            return None
+        return self.to_record(data, url, product_name)
+
+    def to_record(self, data, url, product_name):
+        name_from_site = data.get('name', product_name) or product_name
+        offers = data.get('offers', {})
+        if isinstance(offers, list):
+            offers = offers[0] if offers else {}
+
+        try:
+            price = float(offers.get('price', "0"))
+        except (ValueError, TypeError):
+            price = None
+
+        sku = offers.get('sku') or data.get('sku') or "N/A"
+        return ProductRecord(name_from_site, sku, price, url)
+
+    # Priced products on a listing/search page, keyed by normalized product URL
+    def extract_listing(self, content, page_url):
+        records = {}
+        for block in self.json_ld_blocks(content):
+            try:
+                data = json.loads(block)
+            except ValueError:
+                continue
+            for product in _iter_products(data):
+                offers = product.get('offers', {})
+                if isinstance(offers, list):
+                    offers = offers[0] if offers else {}
+                product_url = product.get('url') or offers.get('url')
+                if not product_url or offers.get('price') is None:
+                    continue
+                key = normalize_url(urljoin(page_url, product_url))
+                records[key] = self.to_record(product, key, product.get('name', ''))
+        return records
+
+# Smallest ancestor of a product link that shows a price and links to no other product
+def _product_tile(link, key, page_url):
+    node = link
+    for _ in range(MAX_TILE_DEPTH):
+        node = node.getparent()
+        if node is None:
+            return None
+        products = {normalize_url(urljoin(page_url, a.get('href'))) for a in TILE_LINK_XPATH(node)}
+        if products != {key}:
+            return None
+        if PRICE_RE.search(node.text_content()):
+            return node
+    return None
+
+# Text of an element with struck-through (old) prices left out
+def _shown_text(el):
+    el = copy.deepcopy(el)
+    for struck in STRUCK_PRICE_XPATH(el):
+        struck.drop_tree()
+    return el.text_content()
+
+def _tile_price(tile):
+    for el in TILE_PRICE_XPATH(tile):
+        if OLD_PRICE_CLASS_RE.search(el.get('class', '')):
+            continue
+        match = PRICE_RE.search(_shown_text(el))
+        if match:
+            return float(match.group(1).replace(',', ''))
+    match = PRICE_RE.search(_shown_text(tile))
+    return float(match.group(1).replace(',', '')) if match else None
+
+def _tile_sku(tile):
+    for el in tile.iter():
+        for attribute in SKU_ATTRIBUTES:
+            if el.get(attribute):
+                return el.get(attribute).strip()
+    match = SKU_RE.search(tile.text_content())
+    return match.group(1) if match else "N/A"
+
+def _tile_name(tile, key):
+    for a in TILE_LINK_XPATH(tile):
+        text = ' '.join(a.text_content().split())
+        if text and not PRICE_RE.search(text):
+            return text
+    for a in TILE_LINK_XPATH(tile):
+        for img in a.iter('img'):
+            if img.get('alt'):
+                return img.get('alt').strip()
+    return key.rsplit('/', 1)[-1].replace('-', ' ').capitalize()
+
+# Generic JSON-LD extractor, used for any host without its own entry
+class JsonLdExtractor(Extractor):
+    pass
+
+# FCP Euro puts the Product JSON-LD in a plain <script> block, so a regex over the bytes finds it without building a DOM
+class FcpEuroExtractor(Extractor):
+    hosts = ('fcpeuro.com',)
+
+    def fast_path(self, content):
+        return _load_blocks(JSON_LD_RE.findall(content))
+
+    def json_ld_blocks(self, content):
+        return JSON_LD_RE.findall(content) or super().json_ld_blocks(content)
+
+    # FCP Euro category/search pages render products as HTML tiles rather than JSON-LD
+    def extract_listing(self, content, page_url):
+        records = super().extract_listing(content, page_url)
+        tree = html.fromstring(content)
+        for link in PRODUCT_LINK_XPATH(tree):
+            key = normalize_url(urljoin(page_url, link.get('href')))
+            if key in records:
+                continue
+            tile = _product_tile(link, key, page_url)
+            if tile is None:
+                continue
+            price = _tile_price(tile)
+            if price is None:
+                continue
+            records[key] = ProductRecord(_tile_name(tile, key), _tile_sku(tile), price, key)
+        return records
+
+GENERIC = JsonLdExtractor()
+
+def register(extractor):
+    for host in extractor.hosts:
+        _REGISTRY[host] = extractor
+    return extractor
+
+def _host(url):
+    host = (urlsplit(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+# Canonical form used to match links: https, no "www.", no query, fragment or trailing slash
+def normalize_url(url):
+    url = url.strip()
+    if not url.lower().startswith(("http://", "https://")):
+        url = "https://" + url
+    parts = urlsplit(url)
+    return urlunsplit(("https", _host(url), parts.path.rstrip('/'), "", ""))
+
+# Pick the extractor registered for the URL's host, falling back to generic JSON-LD
+def extractor_for(url):
+    return _REGISTRY.get(_host(url), GENERIC)
+
+# True when a site-specific extractor is registered for the URL's host
+def is_supported(url):
+    return _host(url) in _REGISTRY
+
+def extract_product(content, url, product_name):
+    return extractor_for(url).extract(content, url, product_name)
+
+register(FcpEuroExtractor())
@@ -0,0 +1,45 @@
+# price_scraper/harvester.py
+
+import os
+import logging
+import requests
+from extractors import extractor_for
+from scraper import HEADERS
+
+LISTINGS_FILE = 'listing_links.txt'
+
+# Listing/search pages per section, stored like input_links.txt as "Car|listing URL"
+def load_listing_pages(path=LISTINGS_FILE):
+    listings = {}
+    if not os.path.exists(path):
+        return listings
+    with open(path, 'r') as f:
+        for line in f:
+            if '|' in line:
+                car_model, url = line.strip().split('|', 1)
+                listings.setdefault(car_model, []).append(url)
+    return listings
+
+# Collect every priced product on the listing pages, keyed by normalized URL.
+# Pass the same cache for the whole run so a page shared by several cars is fetched once.
+def harvest_listings(listing_urls, session=None, cache=None):
+    session = session or requests.Session()
+    cache = {} if cache is None else cache
+    harvested = {}
+    for listing_url in listing_urls:
+        if listing_url in cache:
+            harvested.update(cache[listing_url])
+            continue
+        cache[listing_url] = {}
+        try:
+            response = session.get(listing_url, headers=HEADERS)
+            if response.status_code != 200:
+                logging.warning(f"❌ Failed to fetch listing {listing_url} | Status: {response.status_code}")
+                continue
+            records = extractor_for(listing_url).extract_listing(response.content, listing_url)
+            logging.info(f"📄 {len(records)} priced products on {listing_url}")
+            cache[listing_url] = records
+            harvested.update(records)
+        except Exception as e:
+            logging.error(f"🚨 Error harvesting listing {listing_url}: {e}")
+    return harvested
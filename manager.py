@@ -1,6 +1,7 @@
 # price_scraper/manager.py
 
 import os
+from catalog import INPUT_FILE
 
 CARS_FILE = 'cars.txt'
 URLS_FILE = 'urls.txt'
@@ -114,6 +115,22 @@ def delete_part():
     except ValueError:
         print("❌ Invalid input.")
 
+# Bulk links go to the scraper's input_links.txt, not this manager's cars.txt/urls.txt
+def bulk_import():
+    print(f"ℹ️ Links are added to the scraper catalog ({INPUT_FILE}), not to the parts list above.")
+    path = input("📄 Enter path to CSV, text or bookmarks file: ").strip()
+    if not os.path.exists(path):
+        print("❌ File not found.")
+        return
+    car_name = input("🚗 Car for links that don't name one (blank to skip): ").strip()
+    print("⏳ Checking links...")
+    # Imported here so the menu starts without requests/lxml
+    from bulk_import import import_links
+    accepted, rejected, report_path = import_links([path], car_name)
+    print(f"✅ Added {len(accepted)} links to {INPUT_FILE}.")
+    if rejected:
+        print(f"⚠️ Rejected {len(rejected)} links — see {report_path}")
+
 def main_menu():
     while True:
         print("\n========== Car Parts Manager ==========")
@@ -123,10 +140,11 @@ def main_menu():
         print("4. Add Part 🛒")
         print("5. View Parts 📦")
         print("6. Delete Part ❌")
-        print("7. Exit 🚀")
+        print("7. Bulk Import to Scraper Catalog 📥")
+        print("8. Exit 🚀")
         print("========================================")
 
-        choice = input("Select an option (1-7): ").strip()
+        choice = input("Select an option (1-8): ").strip()
 
         if choice == '1':
             view_cars()
@@ -141,6 +159,8 @@ def main_menu():
         elif choice == '6':
             delete_part()
         elif choice == '7':
+            bulk_import()
+        elif choice == '8':
             print("👋 Exiting. Bye!")
             break
         else:
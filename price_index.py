@@ -0,0 +1,86 @@
+# price_scraper/price_index.py
+
+import json
+import os
+import shutil
+import tempfile
+
+RED = "FF0000"
+GREEN = "00B050"
+BLACK = "000000"
+
+# Sidecar file kept next to the workbook, e.g. CarParts_Pricing.prices.json
+def sidecar_path(file_path):
+    return os.path.splitext(file_path)[0] + '.prices.json'
+
+# Last known price and date per (section, URL), so colouring never has to read the workbook
+class PriceIndex:
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self.layouts = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    saved = json.load(f)
+                self.entries = saved.get("prices", {})
+                self.layouts = saved.get("layouts", {})
+            except (OSError, ValueError, AttributeError):
+                self.entries = {}
+                self.layouts = {}
+
+    # Latest observation from a day before today_iso, or None if there isn't one
+    def previous(self, section, url, today_iso):
+        entry = self.entries.get(section, {}).get(url)
+        if entry is None:
+            return None
+        if entry["date"] < today_iso:
+            return entry["price"]
+        return entry.get("prev_price")
+
+    def record(self, section, url, price, today_iso):
+        if not isinstance(price, (int, float)):
+            return
+        section_entries = self.entries.setdefault(section, {})
+        entry = section_entries.get(url)
+        if entry is None:
+            section_entries[url] = {"price": price, "date": today_iso}
+            return
+        # Re-running on the same day keeps the earlier day as the comparison point
+        if entry["date"] < today_iso:
+            entry["prev_price"] = entry["price"]
+            entry["prev_date"] = entry["date"]
+        entry["price"] = price
+        entry["date"] = today_iso
+
+    # Header columns (name, SKU, URL) last written to the section's sheet
+    def layout(self, section):
+        return self.layouts.get(section)
+
+    def set_layout(self, section, columns):
+        self.layouts[section] = [list(column) for column in columns]
+
+    # Write to a temp file and swap it in so a crash never leaves a half-written index
+    def save(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump({"prices": self.entries, "layouts": self.layouts}, f, separators=(',', ':'))
+            # mkstemp creates the file as 0600; keep the permissions the index already had
+            if os.path.exists(self.path):
+                shutil.copymode(self.path, tmp_path)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+def price_color(price, previous_price):
+    if not isinstance(price, (int, float)) or not isinstance(previous_price, (int, float)):
+        return BLACK
+    if price > previous_price:
+        return RED
+    if price < previous_price:
+        return GREEN
+    return BLACK
@@ -0,0 +1,68 @@
+# price_scraper/records.py
+
+import math
+import sys
+from array import array
+
+STATUS_OK = 0
+STATUS_NO_PRICE = 1
+STATUS_FAILED = 2
+
+# One scraped product; __slots__ keeps it far smaller than a four-key dict
+class ProductRecord:
+    __slots__ = ("name", "sku", "price", "url")
+
+    def __init__(self, name, sku, price, url):
+        self.name = name
+        self.sku = sku
+        self.price = price
+        self.url = url
+
+    def __repr__(self):
+        return f"ProductRecord(name={self.name!r}, sku={self.sku!r}, price={self.price!r}, url={self.url!r})"
+
+# Columnar results for one section: interned strings, a float price array and a status array
+class ProductBatch:
+    __slots__ = ("section", "names", "skus", "urls", "prices", "status")
+
+    def __init__(self, section):
+        self.section = section
+        self.names = []
+        self.skus = []
+        self.urls = []
+        self.prices = array('d')
+        self.status = array('b')
+
+    def __len__(self):
+        return len(self.urls)
+
+    def append(self, record):
+        price = record.price
+        self.names.append(sys.intern(str(record.name)))
+        self.skus.append(sys.intern(str(record.sku)))
+        self.urls.append(record.url)
+        if price is None:
+            self.prices.append(math.nan)
+            self.status.append(STATUS_NO_PRICE)
+        else:
+            self.prices.append(price)
+            self.status.append(STATUS_OK)
+
+    # Keep the URL of a page that could not be scraped so stats can see the gap
+    def append_failed(self, url, name=""):
+        self.names.append(sys.intern(name))
+        self.skus.append("N/A")
+        self.urls.append(url)
+        self.prices.append(math.nan)
+        self.status.append(STATUS_FAILED)
+
+    def fetched_count(self):
+        return len(self.status) - self.status.count(STATUS_FAILED)
+
+    # Yield (name, sku, price, url) for every scraped product, price None when missing
+    def rows(self):
+        for name, sku, price, url, status in zip(self.names, self.skus, self.prices, self.urls, self.status):
+            if status == STATUS_FAILED:
+                continue
+            yield name, sku, (None if status == STATUS_NO_PRICE else price), url
+
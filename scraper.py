@@ -1,9 +1,9 @@
 # price_scraper/scraper.py
 
 import requests
-import json
-from lxml import html
 import logging
+from extractors import extract_product, normalize_url
+from records import ProductBatch, ProductRecord
 
 logging.basicConfig(
     filename='price_puller.log',
@@ -11,45 +11,50 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 
-def get_product_info(url, product_name):
-    headers = {
-        "accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8",
-        "user-agent": "Mozilla/5.0"
-    }
+HEADERS = {
+    "accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8",
+    "user-agent": "Mozilla/5.0"
+}
 
+def get_product_info(url, product_name):
     try:
-        response = requests.get(url, headers=headers)
+        response = requests.get(url, headers=HEADERS)
         if response.status_code != 200:
             logging.warning(f"❌ Failed to fetch page for {product_name} | Status: {response.status_code}")
             return None
 
-        tree = html.fromstring(response.content)
-        script_content = tree.xpath('//script[@type="application/ld+json"]/text()')
-        if not script_content:
+        record = extract_product(response.content, url, product_name)
+        if record is None:
             logging.warning(f"⚠️ No JSON-LD found for {product_name}")
-            return None
-
-        data = json.loads(script_content[0])
-
-        name_from_site = data.get('name', product_name) or product_name
-        offers = data.get('offers', {})
-        if isinstance(offers, list):
-            offers = offers[0]
-
-        try:
-            price = float(offers.get('price', "0"))
-        except (ValueError, TypeError):
-            price = None
-
-        sku = offers.get('sku', "N/A")
-
-        return {
-            "Name": name_from_site,
-            "SKU": sku,
-            "Price": price,
-            "URL": url
-        }
+        return record
 
     except Exception as e:
         logging.error(f"🚨 Error fetching data for {product_name}: {e}")
         return None
+
+# Scrape one section into a batch. A listing page only supplies the price, and only for parts whose
+# name and SKU are already known (url -> (name, sku) from the stored layout); the rest are fetched.
+def scrape_section(section, urls, harvested=None, known=None):
+    batch = ProductBatch(section)
+    harvested = harvested or {}
+    known = {normalize_url(url): columns for url, columns in (known or {}).items()}
+    fetched = 0
+
+    for url in urls:
+        name_guess = url.split('/')[-1].replace('-', ' ').capitalize()
+        key = normalize_url(url)
+        listed = harvested.get(key)
+        if listed is not None and key in known:
+            name, sku = known[key]
+            record = ProductRecord(name, sku, listed.price, url)
+        else:
+            record = get_product_info(url, name_guess)
+            fetched += 1
+        if record:
+            batch.append(record)
+        else:
+            batch.append_failed(url, name_guess)
+
+    if harvested:
+        logging.info(f"📄 {section}: {len(urls) - fetched} of {len(urls)} prices taken from listing pages")
+    return batch
@@ -0,0 +1,84 @@
+# price_scraper/search_view.py
+
+import pandas as pd
+
+SEARCH_DELAY_MS = 250
+PAGE_SIZE = 20
+
+# Build one lowercase search key per row so a query is a single vectorized scan
+def build_search_index(data, columns=("Part Name", "Part Number")):
+    key = pd.Series("", index=data.index, dtype=object)
+    for column in columns:
+        if column in data.columns:
+            key = key + data[column].fillna("").astype(str).str.lower() + "\n"
+    return key
+
+# Return the rows of data whose search key contains the query
+def find_matches(data, search_index, query):
+    query = query.strip().lower()
+    if not query:
+        return data
+    mask = search_index.str.contains(query, regex=False)
+    return data[mask.to_numpy()]
+
+# Run a callback once typing pauses; each keystroke cancels the pending run
+class DebouncedSearch:
+    def __init__(self, widget, callback, delay_ms=SEARCH_DELAY_MS):
+        self.widget = widget
+        self.callback = callback
+        self.delay_ms = delay_ms
+        self._pending = None
+
+    def schedule(self, *args):
+        self.cancel()
+        self._pending = self.widget.after(self.delay_ms, self._fire)
+
+    def cancel(self):
+        if self._pending is not None:
+            self.widget.after_cancel(self._pending)
+            self._pending = None
+
+    def _fire(self):
+        self._pending = None
+        self.callback()
+
+# Hold the full match set but only hand out the rows for the visible page
+class PagedResults:
+    def __init__(self, page_size=PAGE_SIZE):
+        self.page_size = page_size
+        self.rows = None
+        self.page = 0
+
+    def set_matches(self, rows):
+        self.rows = rows
+        self.page = 0
+
+    @property
+    def total(self):
+        return 0 if self.rows is None else len(self.rows)
+
+    @property
+    def page_count(self):
+        return max(1, -(-self.total // self.page_size))
+
+    def next_page(self):
+        if self.page + 1 < self.page_count:
+            self.page += 1
+            return True
+        return False
+
+    def prev_page(self):
+        if self.page > 0:
+            self.page -= 1
+            return True
+        return False
+
+    def visible(self):
+        if self.rows is None:
+            return []
+        start = self.page * self.page_size
+        return self.rows.iloc[start:start + self.page_size]
+
+    def summary(self):
+        label = "match" if self.total == 1 else "matches"
+        return f"{self.total:,} {label} — page {self.page + 1}/{self.page_count}"
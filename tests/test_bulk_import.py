@@ -0,0 +1,75 @@
+import os
+import stat
+
+import bulk_import
+
+
+def test_links_without_scheme_are_cleaned_before_checks(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    catalog = tmp_path / "input_links.txt"
+    catalog.write_text("# tracked parts\nE39 M5|https://www.fcpeuro.com/products/a\n\n")
+    os.chmod(catalog, 0o644)
+    links = tmp_path / "links.csv"
+    links.write_text(
+        "www.fcpeuro.com/products/c?utm=1,E39 M5\n"
+        "E46 M3,HTTP://WWW.FCPEURO.COM/products/d\n"
+        "fcpeuro.com/products/a/,E39 M5\n"
+        "fcpeuro.com/products/e\n"
+    )
+
+    accepted, rejected, _ = bulk_import.import_links([str(links)], "E92 M3", catalog_path=str(catalog),
+                                                     validate=False)
+
+    assert accepted == [
+        ("E39 M5", "https://www.fcpeuro.com/products/c"),
+        ("E46 M3", "http://www.fcpeuro.com/products/d"),
+        ("E92 M3", "https://fcpeuro.com/products/e"),
+    ]
+    assert [reason for _, _, reason in rejected] == ["duplicate"]
+    # Comments and blank lines survive the rewrite, and a backup was taken first
+    assert catalog.read_text() == (
+        "# tracked parts\nE39 M5|https://www.fcpeuro.com/products/a\n\n"
+        "E39 M5|https://www.fcpeuro.com/products/c\n"
+        "E46 M3|http://www.fcpeuro.com/products/d\n"
+        "E92 M3|https://fcpeuro.com/products/e\n"
+    )
+    assert stat.S_IMODE(os.stat(catalog).st_mode) == 0o644
+    assert len(list((tmp_path / "backups").iterdir())) == 1
+
+
+PAGES = {
+    "https://www.fcpeuro.com/products/good": (200, b'<script type="application/ld+json">'
+                                              b'{"@type": "Product", "name": "Oil Filter", "sku": "11427953125",'
+                                              b' "offers": {"price": "12.99"}}</script>'),
+    "https://www.fcpeuro.com/products/gone": (404, b""),
+    "https://www.fcpeuro.com/products/nosku": (200, b'<script type="application/ld+json">'
+                                               b'{"@type": "Product", "offers": {"price": "5.00"}}</script>'),
+    "https://www.fcpeuro.com/products/plain": (200, b"<html><body>Oil Filter</body></html>"),
+}
+
+
+class _Session:
+    created = []
+
+    def __init__(self):
+        _Session.created.append(self)
+
+    def get(self, url, headers=None, timeout=None):
+        status, content = PAGES[url]
+        return type("Response", (), {"status_code": status, "content": content})()
+
+
+def test_links_are_probed_before_import(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(bulk_import.requests, "Session", _Session)
+    links = tmp_path / "links.txt"
+    links.write_text("".join(f"E39 M5|{url}\n" for url in PAGES))
+
+    accepted, rejected, report_path = bulk_import.import_links([str(links)], catalog_path=str(tmp_path / "input_links.txt"),
+                                                               workers=2)
+
+    assert accepted == [("E39 M5", "https://www.fcpeuro.com/products/good")]
+    assert sorted((url.rsplit("/", 1)[-1], reason) for _, url, reason in rejected) == [
+        ("gone", "HTTP 404"), ("nosku", "no SKU on page"), ("plain", "no JSON-LD product data")]
+    assert 1 <= len(_Session.created) <= 2
+    assert os.path.exists(report_path)
@@ -0,0 +1,79 @@
+import os
+from urllib.parse import urljoin
+
+import pytest
+from lxml import html
+
+import harvester
+from extractors import extractor_for, normalize_url
+from records import STATUS_FAILED, STATUS_OK
+from scraper import scrape_section
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "fcp_listing.html")
+# A category page saved from the live site ("Save page as", HTML only); fcp_listing.html is hand-written
+SAVED_PAGE = os.path.join(os.path.dirname(__file__), "fixtures", "fcp_category.html")
+LISTING_URL = "https://www.fcpeuro.com/BMW-parts/M3/?year=2004"
+
+CLUTCH = "https://www.fcpeuro.com/products/bmw-clutch-kit-m3-e46-luk-21212282667"
+SLAVE = "https://www.fcpeuro.com/products/bmw-clutch-slave-cylinder-oem-21526785966"
+DIFF = "https://www.fcpeuro.com/products/bmw-differential-cover-kit-33112282482kt"
+
+
+def _listing():
+    with open(FIXTURE, "rb") as f:
+        return f.read()
+
+
+def test_fcp_listing_tiles_are_parsed():
+    records = extractor_for(LISTING_URL).extract_listing(_listing(), LISTING_URL)
+
+    assert set(records) == {normalize_url(CLUTCH), normalize_url(SLAVE)}
+    clutch = records[normalize_url(CLUTCH)]
+    assert (clutch.name, clutch.sku, clutch.price) == ("BMW Clutch Kit - LuK 21212282667", "21212282667", 989.39)
+    slave = records[normalize_url(SLAVE)]
+    assert (slave.name, slave.sku, slave.price) == ("BMW Clutch Slave Cylinder - OEM", "21526785966", 112.5)
+
+
+@pytest.mark.skipif(not os.path.exists(SAVED_PAGE), reason="no saved FCP Euro category page in tests/fixtures")
+def test_saved_fcp_category_page_is_parsed():
+    with open(SAVED_PAGE, "rb") as f:
+        content = f.read()
+    records = extractor_for(LISTING_URL).extract_listing(content, LISTING_URL)
+
+    tiles = {normalize_url(urljoin(LISTING_URL, a.get("href"))) for a in html.fromstring(content).xpath('//a[contains(@href, "/products/")]')}
+    # Most product links on the page sit in a priced tile, and each tile yields exactly its own product
+    assert len(records) >= len(tiles) // 2
+    for key, record in records.items():
+        assert key in tiles and record.url == key
+        assert "/products/" in key and key == normalize_url(key)
+        assert record.price > 0
+        assert record.name and "$" not in record.name
+
+
+class _Session:
+    def __init__(self):
+        self.calls = []
+
+    def get(self, url, headers=None):
+        self.calls.append(url)
+        return type("Response", (), {"status_code": 200, "content": _listing()})()
+
+
+def test_shared_listing_is_fetched_once_per_run(monkeypatch):
+    session = _Session()
+    cache = {}
+    first = harvester.harvest_listings([LISTING_URL], session, cache)
+    second = harvester.harvest_listings([LISTING_URL], session, cache)
+
+    assert session.calls == [LISTING_URL]
+    assert first == second
+
+    fetched = []
+    monkeypatch.setattr("scraper.get_product_info", lambda url, name: fetched.append(url))
+    known = {CLUTCH: ("Clutch Kit (LuK)", "21212282667")}
+    batch = scrape_section("E46 M3", [CLUTCH, SLAVE, DIFF], second, known)
+
+    # The listing only prices parts already in the sheet; new parts still get their product page
+    assert fetched == [SLAVE, DIFF]
+    assert list(batch.rows())[0] == ("Clutch Kit (LuK)", "21212282667", 989.39, CLUTCH)
+    assert list(batch.status) == [STATUS_OK, STATUS_FAILED, STATUS_FAILED]
@@ -0,0 +1,18 @@
+import os
+import stat
+
+from price_index import PriceIndex
+
+
+def test_save_keeps_existing_permissions(tmp_path):
+    path = str(tmp_path / "CarParts_Pricing.prices.json")
+    index = PriceIndex(path)
+    index.record("E92 M3", "https://www.fcpeuro.com/products/a", 10.0, "2025-05-01")
+    index.save()
+    os.chmod(path, 0o644)
+
+    index.record("E92 M3", "https://www.fcpeuro.com/products/a", 12.0, "2025-05-02")
+    index.save()
+
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o644
+    assert PriceIndex(path).previous("E92 M3", "https://www.fcpeuro.com/products/a", "2025-05-03") == 12.0
@@ -0,0 +1,67 @@
+import pandas as pd
+
+from search_view import DebouncedSearch, PagedResults, build_search_index, find_matches
+
+
+def _parts():
+    return pd.DataFrame({
+        "Part Name": ["Oil Filter", "a.b Bracket", "Brake Pad (Front)", None],
+        "Part Number": ["11427953125", "AB-1", "34116797859", "99"],
+    })
+
+
+def test_query_is_matched_literally():
+    data = _parts()
+    index = build_search_index(data)
+
+    assert list(find_matches(data, index, "a.b")["Part Number"]) == ["AB-1"]
+    assert list(find_matches(data, index, "(")["Part Number"]) == ["34116797859"]
+    assert list(find_matches(data, index, "  OIL ")["Part Number"]) == ["11427953125"]
+    assert find_matches(data, index, "   ") is data
+
+
+def test_pages_clamp_at_the_ends():
+    results = PagedResults(page_size=2)
+    assert results.visible() == []
+    assert results.page_count == 1
+    assert results.summary() == "0 matches — page 1/1"
+
+    results.set_matches(pd.DataFrame({"n": range(5)}))
+    assert not results.prev_page()
+    assert results.next_page() and results.next_page()
+    assert not results.next_page()
+    assert list(results.visible()["n"]) == [4]
+    assert results.summary() == "5 matches — page 3/3"
+
+    results.set_matches(pd.DataFrame({"n": range(1)}))
+    assert results.page == 0
+    assert results.summary() == "1 match — page 1/1"
+
+
+class _Widget:
+    def __init__(self):
+        self.jobs = {}
+        self.next_id = 0
+
+    def after(self, delay_ms, callback):
+        self.next_id += 1
+        self.jobs[self.next_id] = callback
+        return self.next_id
+
+    def after_cancel(self, job):
+        del self.jobs[job]
+
+
+def test_newer_keystroke_cancels_pending_search():
+    widget = _Widget()
+    calls = []
+    search = DebouncedSearch(widget, lambda: calls.append(len(calls)))
+
+    search.schedule()
+    search.schedule()
+    assert list(widget.jobs) == [2]
+
+    widget.jobs.pop(2)()
+    assert calls == [0]
+    search.cancel()
+    assert widget.jobs == {}
@@ -0,0 +1,43 @@
+import os
+
+from openpyxl import load_workbook
+
+import utils
+from records import ProductBatch, ProductRecord
+from utils import INDEX_FILE, _list_shards, _write_shard, write_sharded
+
+DAY = "05/01/2025"
+
+
+def _batch(section, count):
+    batch = ProductBatch(section)
+    for i in range(count):
+        batch.append(ProductRecord(f"Part {i}", f"SKU{i}", 10.0 + i, f"https://www.fcpeuro.com/products/{section[:4]}-{i}"))
+    return batch
+
+
+def test_shards_and_index_are_written(tmp_path):
+    shard_dir = str(tmp_path / "shards")
+    batches = [_batch("W204 C63 AMG", 3), _batch("E92 M3", 2), _batch("E46 M3", 0)]
+
+    written = write_sharded(batches, DAY, shard_dir=shard_dir, build_index=True, max_workers=2)
+
+    assert sorted(batch.section for batch in written) == ["E92 M3", "W204 C63 AMG"]
+    assert sorted(f for f in os.listdir(shard_dir) if f.endswith(".xlsx")) == [
+        INDEX_FILE, "E92_M3.xlsx", "W204_C63_AMG.xlsx"]
+    assert [shard[:3] for shard in _list_shards(shard_dir)] == [
+        ("E92 M3", "E92_M3.xlsx", 2), ("W204 C63 AMG", "W204_C63_AMG.xlsx", 3)]
+
+    ws = load_workbook(os.path.join(shard_dir, INDEX_FILE))["Index"]
+    rows = [[cell.value for cell in row[:3]] for row in ws.iter_rows(min_row=2)]
+    assert rows == [["E92 M3", "E92_M3.xlsx", 2], ["W204 C63 AMG", "W204_C63_AMG.xlsx", 3]]
+    assert ws["B2"].hyperlink.target == "E92_M3.xlsx"
+
+
+def test_locked_shard_reports_failure(tmp_path, monkeypatch):
+    def locked(*args):
+        raise PermissionError("file is open")
+    monkeypatch.setattr(utils, "_write_full_workbook", locked)
+
+    assert _write_shard(_batch("E92 M3", 2), DAY, str(tmp_path)) is False
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,94 @@
+import os
+import stat
+import zipfile
+from datetime import datetime
+
+from openpyxl import Workbook, load_workbook
+from openpyxl.formatting.rule import Rule
+from openpyxl.styles import Font
+from openpyxl.styles.differential import DifferentialStyle
+from openpyxl.styles.numbers import NumberFormat
+
+from price_index import BLACK, GREEN, RED
+from records import ProductBatch, ProductRecord
+import utils
+from utils import write_to_excel
+from xlsx_patch import PRICE_FORMAT, append_price_row
+
+URLS = [f"https://www.fcpeuro.com/products/part-{i}" for i in range(3)]
+
+
+def _batch(prices):
+    batch = ProductBatch("E92 M3")
+    for i, (url, price) in enumerate(zip(URLS, prices)):
+        batch.append(ProductRecord(f"Part {i}", f"SKU{i}", price, url))
+    return batch
+
+
+def _members(file_path, skip):
+    with zipfile.ZipFile(file_path) as zf:
+        return {name: zf.read(name) for name in zf.namelist() if name not in skip}
+
+
+def _row(ws, day):
+    row_index = 4 + (datetime.strptime(day, "%m/%d/%Y") - datetime(2025, 4, 24)).days
+    return [ws.cell(row=row_index, column=col) for col in range(1, 2 + len(URLS))]
+
+
+def test_patched_days_reload_with_values_and_colours(tmp_path, monkeypatch):
+    file_path = str(tmp_path / "CarParts_Pricing.xlsx")
+    full_writes = []
+    full_write = utils._write_full_workbook
+    monkeypatch.setattr(utils, "_write_full_workbook", lambda *args: full_writes.append(args) or full_write(*args))
+    days = [
+        ("05/01/2025", [10.0, 20.0, 30.0]),
+        ("05/02/2025", [12.0, 18.0, 30.0]),
+        ("05/04/2025", [11.0, 18.0, None]),   # 05/03 skipped, one price missing
+        ("05/05/2025", [11.0, 25.0, 31.0]),
+    ]
+    for day, prices in days:
+        assert write_to_excel(_batch(prices), day, file_path)
+        if day == days[0][0]:
+            untouched = _members(file_path, skip=("xl/worksheets/sheet1.xml", "xl/styles.xml"))
+            os.chmod(file_path, 0o644)
+
+    # Only the first day needed openpyxl; the rest were patched and every other part copied through as is
+    assert len(full_writes) == 1
+    assert stat.S_IMODE(os.stat(file_path).st_mode) == 0o644
+    with zipfile.ZipFile(file_path) as zf:
+        assert zf.testzip() is None
+    assert _members(file_path, skip=("xl/worksheets/sheet1.xml", "xl/styles.xml")) == untouched
+
+    ws = load_workbook(file_path)["E92 M3"]
+    assert ws.cell(row=1, column=2).hyperlink.target == URLS[0]
+
+    expected = {
+        "05/02/2025": [(12.0, RED), (18.0, GREEN), (30.0, BLACK)],
+        "05/04/2025": [(11.0, GREEN), (18.0, BLACK), (None, BLACK)],
+        "05/05/2025": [(11.0, BLACK), (25.0, RED), (31.0, RED)],
+    }
+    for day, cells in expected.items():
+        date_cell, *price_cells = _row(ws, day)
+        assert date_cell.value == datetime.strptime(day, "%m/%d/%Y")
+        assert date_cell.number_format == "mm/dd/yyyy"
+        for cell, (value, color) in zip(price_cells, cells):
+            assert cell.value == value
+            assert cell.number_format == PRICE_FORMAT
+            assert cell.font.color.rgb[-6:] == color
+
+
+def test_dxf_number_format_is_not_reused_for_cells(tmp_path):
+    file_path = str(tmp_path / "book.xlsx")
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "E92 M3"
+    ws["A1"] = "Name"
+    dxf = DifferentialStyle(font=Font(bold=True), numFmt=NumberFormat(numFmtId=164, formatCode=PRICE_FORMAT))
+    ws.conditional_formatting.add("B4:B100", Rule(type="expression", dxf=dxf, formula=["TRUE"]))
+    wb.save(file_path)
+
+    append_price_row(file_path, "E92 M3", 5, datetime(2025, 5, 1), [(9.5, RED)])
+
+    cell = load_workbook(file_path)["E92 M3"]["B5"]
+    assert cell.value == 9.5
+    assert cell.number_format == PRICE_FORMAT
@@ -1,14 +1,23 @@
 # price_scraper/utils.py
 
 import os
+import re
+import logging
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 import pytz
 from openpyxl import Workbook, load_workbook
 from openpyxl.styles import Font, Alignment
 from openpyxl.utils import get_column_letter
+from price_index import PriceIndex, price_color, sidecar_path
+from xlsx_patch import PatchNotPossible, append_price_row
 
 est = pytz.timezone('US/Eastern')
 
+SHARD_DIR = 'CarParts_Pricing'
+INDEX_FILE = 'CarParts_Index.xlsx'
+
 def merge_price_label_row(ws, start_col, product_count):
     from_col = get_column_letter(start_col)
     to_col = get_column_letter(start_col + product_count - 1)
@@ -17,12 +26,89 @@ def merge_price_label_row(ws, start_col, product_count):
     ws[f'{from_col}3'].font = Font(bold=True)
     ws[f'{from_col}3'].alignment = Alignment(horizontal='center')
 
-def write_to_excel(section_name, product_results, today_str, file_path='CarParts_Pricing.xlsx'):
+def write_to_excel(batch, today_str, file_path='CarParts_Pricing.xlsx'):
     base_date = datetime(2025, 4, 24)
     today_date = datetime.strptime(today_str, "%m/%d/%Y")
     days_since = (today_date - base_date).days
     row_index = 4 + days_since
+    section_name = batch.section
+    today_iso = today_date.strftime("%Y-%m-%d")
+    price_index = PriceIndex(sidecar_path(file_path))
+    if not os.path.exists(price_index.path) and os.path.exists(file_path):
+        _seed_price_index(price_index, file_path)
+
+    rows = list(batch.rows())
+    columns = [[name, sku, url] for name, sku, _, url in rows]
+    # Compare against the last real observation, not whatever sits in the row above
+    colors = [price_color(price, price_index.previous(section_name, url, today_iso)) for _, _, price, url in rows]
+
+    try:
+        # Same columns as last time: only a new date row is needed, so patch the xlsx in place
+        if os.path.exists(file_path) and price_index.layout(section_name) == columns:
+            try:
+                append_price_row(file_path, section_name, row_index, today_date,
+                                 [(price, color) for (_, _, price, _), color in zip(rows, colors)])
+            except (PatchNotPossible, KeyError, ValueError, zipfile.BadZipFile) as e:
+                logging.info(f"↩️ In-place patch skipped for {section_name}: {e}")
+                _write_full_workbook(section_name, rows, colors, row_index, today_date, file_path)
+        else:
+            _write_full_workbook(section_name, rows, colors, row_index, today_date, file_path)
+
+        for _, _, price, url in rows:
+            price_index.record(section_name, url, price, today_iso)
+        price_index.set_layout(section_name, columns)
+        price_index.save()
+        print(f"✅ Saved pricing to {file_path}")
+        logging.info(f"✅ Excel updated for section: {section_name}")
+        return True
+    except PermissionError:
+        print("❌ Excel file is open! Please close it and try again.")
+        logging.error("❌ Excel File open — save failed.")
+        return False
 
+# Name and SKU of every part last written to the section's sheet, keyed by URL
+def known_columns(section_name, file_path='CarParts_Pricing.xlsx'):
+    layout = PriceIndex(sidecar_path(file_path)).layout(section_name) or []
+    return {url: (name, sku) for name, sku, url in layout}
+
+# First run after upgrading: fill the sidecar from the prices already in the workbook
+def _seed_price_index(price_index, file_path):
+    try:
+        wb = load_workbook(file_path)
+    except (OSError, zipfile.BadZipFile, KeyError, ValueError) as e:
+        logging.warning(f"⚠️ Could not read {file_path} to seed price index: {e}")
+        return
+
+    for ws in wb.worksheets:
+        columns = []
+        history = {}
+        for col in range(2, ws.max_column + 1):
+            name_cell = ws.cell(row=1, column=col)
+            url = name_cell.hyperlink.target if name_cell.hyperlink else None
+            if not url:
+                continue
+            columns.append([name_cell.value, ws.cell(row=2, column=col).value, url])
+            history[col] = (url, [])
+
+        for row in ws.iter_rows(min_row=4):
+            row_date = row[0].value
+            if not isinstance(row_date, datetime):
+                continue
+            for col, (url, observations) in history.items():
+                if col <= len(row) and isinstance(row[col - 1].value, (int, float)):
+                    observations.append((row_date.strftime("%Y-%m-%d"), row[col - 1].value))
+
+        # The last two observations are enough to colour today, even on a same-day re-run
+        for url, observations in history.values():
+            for date_iso, price in observations[-2:]:
+                price_index.record(ws.title, url, price, date_iso)
+        if columns:
+            price_index.set_layout(ws.title, [[str(name), str(sku), url] for name, sku, url in columns])
+
+    logging.info(f"🌱 Seeded price index from {file_path}")
+
+# Full openpyxl load/save, used for new sheets and whenever the header columns change
+def _write_full_workbook(section_name, rows, colors, row_index, today_date, file_path):
     if os.path.exists(file_path):
         wb = load_workbook(file_path)
     else:
@@ -43,11 +129,7 @@ def write_to_excel(section_name, product_results, today_str, file_path='CarParts
             ws.cell(row=r, column=1).alignment = Alignment(horizontal='right')
 
     start_col = 2
-    for idx, product in enumerate(product_results):
-        name = product["Name"]
-        sku = product["SKU"]
-        price = product["Price"]
-        url = product["URL"]
+    for idx, ((name, sku, price, url), color) in enumerate(zip(rows, colors)):
         col = start_col + idx
 
         name_cell = ws.cell(row=1, column=col)
@@ -61,22 +143,9 @@ def write_to_excel(section_name, product_results, today_str, file_path='CarParts
         price_cell = ws.cell(row=row_index, column=col)
         price_cell.value = price
         price_cell.number_format = '"$"#,##0.00'
+        price_cell.font = Font(color=color)
 
-        previous_price_cell = ws.cell(row=row_index - 1, column=col)
-        previous_price = previous_price_cell.value
-
-        if previous_price is not None and isinstance(previous_price, (int, float)) and isinstance(price, (int, float)):
-            if price > previous_price:
-                color = "FF0000"
-            elif price < previous_price:
-                color = "00B050"
-            else:
-                color = "000000"
-            price_cell.font = Font(color=color)
-        else:
-            price_cell.font = Font(color="000000")
-
-    merge_price_label_row(ws, start_col, len(product_results))
+    merge_price_label_row(ws, start_col, len(rows))
 
     ws.cell(row=row_index, column=1).value = today_date
     ws.cell(row=row_index, column=1).number_format = 'mm/dd/yyyy'
@@ -88,8 +157,82 @@ def write_to_excel(section_name, product_results, today_str, file_path='CarParts
             col_letter = get_column_letter(col)
             ws.column_dimensions[col_letter].width = width
 
+    wb.save(file_path)
+
+# Turn a section name like "W204 C63 AMG" into a safe workbook file name
+def shard_file_name(section_name):
+    return re.sub(r'[^A-Za-z0-9._-]+', '_', section_name).strip('_') + '.xlsx'
+
+def _write_shard(batch, today_str, shard_dir):
+    file_path = os.path.join(shard_dir, shard_file_name(batch.section))
+    return write_to_excel(batch, today_str, file_path)
+
+# Write every section to its own workbook in parallel, one process per shard
+def write_sharded(batches, today_str, shard_dir=SHARD_DIR, build_index=False, max_workers=None):
+    os.makedirs(shard_dir, exist_ok=True)
+    batches = [batch for batch in batches if batch.fetched_count()]
+
+    written = []
+    if batches:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = {pool.submit(_write_shard, batch, today_str, shard_dir): batch for batch in batches}
+            for future, batch in futures.items():
+                try:
+                    saved = future.result()
+                except Exception as e:
+                    print(f"❌ Failed to write workbook for {batch.section}: {e}")
+                    continue
+                if saved:
+                    written.append(batch)
+
+    if build_index:
+        write_shard_index(shard_dir)
+    return written
+
+# One (car, file name, part count, last modified) entry per shard workbook on disk
+def _list_shards(shard_dir):
+    shards = []
+    for file_name in os.listdir(shard_dir):
+        if not file_name.endswith('.xlsx') or file_name == INDEX_FILE or file_name.startswith('~$'):
+            continue
+        file_path = os.path.join(shard_dir, file_name)
+        # The sidecar already knows the section name and its columns, so no workbook is opened
+        layouts = PriceIndex(sidecar_path(file_path)).layouts
+        if layouts:
+            section, columns = next(iter(layouts.items()))
+            part_count = len(columns)
+        else:
+            section, part_count = os.path.splitext(file_name)[0].replace('_', ' '), None
+        modified = datetime.fromtimestamp(os.path.getmtime(file_path))
+        shards.append((section, file_name, part_count, modified))
+    return sorted(shards)
+
+# Small workbook listing every shard in shard_dir with a hyperlink to it
+def write_shard_index(shard_dir=SHARD_DIR):
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Index"
+
+    for col, header in enumerate(['Car', 'Workbook', 'Parts', 'Last Updated'], start=1):
+        ws.cell(row=1, column=col).value = header
+        ws.cell(row=1, column=col).font = Font(bold=True)
+
+    for row, (section, file_name, part_count, modified) in enumerate(_list_shards(shard_dir), start=2):
+        ws.cell(row=row, column=1).value = section
+        link_cell = ws.cell(row=row, column=2)
+        link_cell.value = file_name
+        link_cell.hyperlink = file_name
+        link_cell.style = "Hyperlink"
+        ws.cell(row=row, column=3).value = part_count
+        ws.cell(row=row, column=4).value = modified
+        ws.cell(row=row, column=4).number_format = 'mm/dd/yyyy hh:mm'
+
+    for col_letter, width in (('A', 20), ('B', 30), ('C', 8), ('D', 18)):
+        ws.column_dimensions[col_letter].width = width
+
+    index_path = os.path.join(shard_dir, INDEX_FILE)
     try:
-        wb.save(file_path)
-        print(f"✅ Saved pricing to {file_path}")
+        wb.save(index_path)
+        print(f"✅ Saved shard index to {index_path}")
     except PermissionError:
-        print("❌ Excel file is open! Please close it and try again.")
+        print("❌ Index file is open! Please close it and try again.")
@@ -0,0 +1,255 @@
+# price_scraper/xlsx_patch.py
+
+import os
+import re
+import shutil
+import struct
+import tempfile
+import time
+import zipfile
+import zlib
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from xml.sax.saxutils import escape, quoteattr
+
+MAIN_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+REL_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+PKG_REL_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+
+PRICE_FORMAT = '"$"#,##0.00'
+DATE_FORMAT = 'mm/dd/yyyy'
+EXCEL_EPOCH = datetime(1899, 12, 30)
+
+ROW_RE = re.compile(r'<row r="(\d+)"')
+DIMENSION_RE = re.compile(r'<dimension ref="([A-Z]+)(\d+)(?::([A-Z]+)(\d+))?"\s*/>')
+COUNT_RE = re.compile(r'count="\d+"')
+
+STYLES_PART = 'xl/styles.xml'
+
+# Raised when the workbook can't be patched and the caller should do a full openpyxl write
+class PatchNotPossible(Exception):
+    pass
+
+def _column_letter(col):
+    letters = ""
+    while col:
+        col, rem = divmod(col - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+def _column_number(letters):
+    col = 0
+    for ch in letters:
+        col = col * 26 + ord(ch) - 64
+    return col
+
+# Map a sheet name to its part, e.g. "E92 M3" -> "xl/worksheets/sheet3.xml"
+def _sheet_part(zf, sheet_name):
+    workbook = ET.fromstring(zf.read('xl/workbook.xml'))
+    rel_id = None
+    for sheet in workbook.iter(f'{{{MAIN_NS}}}sheet'):
+        if sheet.get('name') == sheet_name:
+            rel_id = sheet.get(f'{{{REL_NS}}}id')
+            break
+    if rel_id is None:
+        raise PatchNotPossible(f"sheet {sheet_name!r} not in workbook")
+
+    rels = ET.fromstring(zf.read('xl/_rels/workbook.xml.rels'))
+    for rel in rels.iter(f'{{{PKG_REL_NS}}}Relationship'):
+        if rel.get('Id') == rel_id:
+            target = rel.get('Target')
+            return target.lstrip('/') if target.startswith('/') else 'xl/' + target
+    raise PatchNotPossible(f"no relationship for sheet {sheet_name!r}")
+
+# Add a child to a styles.xml collection (empty <tag/> included), creating it if asked, and bump its count
+def _append_to_collection(styles, tag, child_tag, child_xml, create_after=None):
+    close_tag = f'</{tag}>'
+    empty = re.search(rf'<{tag}\b[^>]*/>', styles)
+    if close_tag not in styles and empty:
+        return styles[:empty.start()] + f'<{tag} count="1">{child_xml}</{tag}>' + styles[empty.end():]
+    if close_tag not in styles:
+        if create_after is None:
+            raise PatchNotPossible(f"styles.xml has no <{tag}>")
+        anchor = re.search(create_after, styles)
+        return styles[:anchor.end()] + f'<{tag} count="1">{child_xml}</{tag}>' + styles[anchor.end():]
+
+    open_match = re.search(rf'<{tag}\b[^>]*>', styles)
+    opening = open_match.group(0)
+    count = len(re.findall(rf'<{child_tag}\b', styles[open_match.end():styles.index(close_tag)])) + 1
+    if 'count=' in opening:
+        opening = COUNT_RE.sub(f'count="{count}"', opening)
+    else:
+        opening = opening[:-1] + f' count="{count}">'
+    styles = styles[:open_match.start()] + opening + styles[open_match.end():]
+    close_at = styles.index(close_tag)
+    return styles[:close_at] + child_xml + styles[close_at:]
+
+# Look up (or add) the number formats, fonts and cell formats the new row needs
+class _StylePatcher:
+    def __init__(self, styles_xml):
+        self.styles = styles_xml
+        self.changed = False
+        root = ET.fromstring(styles_xml.encode('utf-8'))
+        # Only <numFmts> counts; <dxfs> carry their own numFmt copies that cells can't point at
+        num_fmts = root.find(f'{{{MAIN_NS}}}numFmts')
+        self.num_fmts = {
+            fmt.get('formatCode'): int(fmt.get('numFmtId'))
+            for fmt in (num_fmts if num_fmts is not None else [])
+        }
+        self.taken_fmt_ids = {int(fmt.get('numFmtId')) for fmt in root.iter(f'{{{MAIN_NS}}}numFmt')}
+        self.fonts = []
+        fonts = root.find(f'{{{MAIN_NS}}}fonts')
+        for font in (fonts if fonts is not None else []):
+            children = list(font)
+            color = None
+            if len(children) == 1 and children[0].tag == f'{{{MAIN_NS}}}color' and children[0].get('rgb'):
+                color = children[0].get('rgb')[-6:].upper()
+            self.fonts.append(color)
+        self.xfs = []
+        cell_xfs = root.find(f'{{{MAIN_NS}}}cellXfs')
+        for xf in (cell_xfs if cell_xfs is not None else []):
+            plain = len(xf) == 0 and xf.get('fillId', '0') == '0' and xf.get('borderId', '0') == '0'
+            self.xfs.append((int(xf.get('numFmtId', 0)), int(xf.get('fontId', 0))) if plain else None)
+
+    def num_fmt(self, code):
+        if code not in self.num_fmts:
+            fmt_id = max([163] + list(self.taken_fmt_ids)) + 1
+            child = f'<numFmt numFmtId="{fmt_id}" formatCode={quoteattr(code)}/>'
+            self.styles = _append_to_collection(self.styles, 'numFmts', 'numFmt', child, create_after=r'<styleSheet\b[^>]*>')
+            self.num_fmts[code] = fmt_id
+            self.taken_fmt_ids.add(fmt_id)
+            self.changed = True
+        return self.num_fmts[code]
+
+    def font(self, color):
+        if color is None:
+            return 0
+        color = color.upper()
+        if color not in self.fonts:
+            child = f'<font><color rgb="00{color}"/></font>'
+            self.styles = _append_to_collection(self.styles, 'fonts', 'font', child)
+            self.fonts.append(color)
+            self.changed = True
+        return self.fonts.index(color)
+
+    def cell_xf(self, code, color=None):
+        key = (self.num_fmt(code), self.font(color))
+        if key not in self.xfs:
+            child = (f'<xf numFmtId="{key[0]}" fontId="{key[1]}" fillId="0" borderId="0" xfId="0" '
+                     f'applyNumberFormat="1" applyFont="1"/>')
+            self.styles = _append_to_collection(self.styles, 'cellXfs', 'xf', child)
+            self.xfs.append(key)
+            self.changed = True
+        return self.xfs.index(key)
+
+# Every member's central directory record and the raw bytes of its local entry
+def _read_members(raw):
+    eocd = raw.rfind(b'PK\x05\x06')
+    if eocd < 0:
+        raise zipfile.BadZipFile("no end of central directory")
+    _, _, _, _, total, _, cd_offset, _ = struct.unpack('<IHHHHIIH', raw[eocd:eocd + 22])
+    if total == 0xFFFF or cd_offset == 0xFFFFFFFF:
+        raise PatchNotPossible("zip64 workbooks are not patched in place")
+
+    members = []
+    pos = cd_offset
+    for _ in range(total):
+        fields = struct.unpack('<IHHHHHHIIIHHHHHII', raw[pos:pos + 46])
+        name_len, extra_len, comment_len, local_offset = fields[10], fields[11], fields[12], fields[16]
+        end = pos + 46 + name_len + extra_len + comment_len
+        name = raw[pos + 46:pos + 46 + name_len].decode('utf-8')
+        members.append([name, raw[pos:end], local_offset])
+        pos = end
+
+    # A local entry runs up to the next one (or the central directory), data descriptor included
+    starts = sorted(m[2] for m in members) + [cd_offset]
+    next_start = {start: starts[i + 1] for i, start in enumerate(starts[:-1])}
+    return [(name, central, raw[offset:next_start[offset]]) for name, central, offset in members]
+
+def _deflated_entry(name, data):
+    name_bytes = name.encode('utf-8')
+    compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+    compressed = compressor.compress(data) + compressor.flush()
+    crc = zlib.crc32(data)
+    t = time.localtime()
+    dos_time = t.tm_hour << 11 | t.tm_min << 5 | t.tm_sec // 2
+    dos_date = (t.tm_year - 1980) << 9 | t.tm_mon << 5 | t.tm_mday
+    local = struct.pack('<IHHHHHIIIHH', 0x04034B50, 20, 0, 8, dos_time, dos_date,
+                        crc, len(compressed), len(data), len(name_bytes), 0) + name_bytes + compressed
+    central = struct.pack('<IHHHHHHIIIHHHHHII', 0x02014B50, 20, 20, 0, 8, dos_time, dos_date,
+                          crc, len(compressed), len(data), len(name_bytes), 0, 0, 0, 0, 0, 0) + name_bytes
+    return central, local
+
+# Rebuild the package: replaced parts are re-deflated, every other member is copied as raw bytes
+def _write_package(file_path, raw, replacements):
+    out = bytearray()
+    central_dir = bytearray()
+    members = _read_members(raw)
+    for name, central, local in members:
+        if name in replacements:
+            central, local = _deflated_entry(name, replacements[name])
+        central = central[:42] + struct.pack('<I', len(out)) + central[46:]
+        central_dir += central
+        out += local
+
+    cd_offset = len(out)
+    out += central_dir
+    out += struct.pack('<IHHHHIIH', 0x06054B50, 0, 0, len(members), len(members), len(central_dir), cd_offset, 0)
+
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.xlsx.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(out)
+        # mkstemp creates the file as 0600; keep the permissions the workbook already had
+        shutil.copymode(file_path, tmp_path)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+# Append one dated price row to an existing sheet without re-serializing the workbook.
+# prices is a list of (price, font colour) in column order starting at column B.
+def append_price_row(file_path, sheet_name, row_index, row_date, prices):
+    with open(file_path, 'rb') as f:
+        raw = f.read()
+    with zipfile.ZipFile(file_path) as zf:
+        sheet_part = _sheet_part(zf, sheet_name)
+        sheet_xml = zf.read(sheet_part).decode('utf-8')
+        styles_xml = zf.read(STYLES_PART).decode('utf-8')
+
+    close_at = sheet_xml.rfind('</sheetData>')
+    if close_at < 0:
+        raise PatchNotPossible("sheet has no rows yet")
+    last_row = sheet_xml.rfind('<row r="', 0, close_at)
+    if last_row >= 0 and int(ROW_RE.match(sheet_xml, last_row).group(1)) >= row_index:
+        raise PatchNotPossible(f"row {row_index} is already written")
+
+    patcher = _StylePatcher(styles_xml)
+    date_xf = patcher.cell_xf(DATE_FORMAT)
+    serial = (row_date - EXCEL_EPOCH).days
+
+    cells = [f'<c r="A{row_index}" s="{date_xf}"><v>{serial}</v></c>']
+    for offset, (price, color) in enumerate(prices):
+        ref = f'{_column_letter(2 + offset)}{row_index}'
+        xf = patcher.cell_xf(PRICE_FORMAT, color)
+        if isinstance(price, (int, float)):
+            cells.append(f'<c r="{ref}" s="{xf}"><v>{escape(repr(float(price)))}</v></c>')
+        else:
+            cells.append(f'<c r="{ref}" s="{xf}"/>')
+    row_xml = f'<row r="{row_index}">{"".join(cells)}</row>'
+    sheet_xml = sheet_xml[:close_at] + row_xml + sheet_xml[close_at:]
+
+    last_col = 1 + len(prices)
+    dimension = DIMENSION_RE.search(sheet_xml)
+    if dimension:
+        first = f'{dimension.group(1)}{dimension.group(2)}'
+        max_col = max(last_col, _column_number(dimension.group(3) or dimension.group(1)))
+        new_ref = f'<dimension ref="{first}:{_column_letter(max_col)}{row_index}"/>'
+        sheet_xml = sheet_xml[:dimension.start()] + new_ref + sheet_xml[dimension.end():]
+
+    replacements = {sheet_part: sheet_xml.encode('utf-8')}
+    if patcher.changed:
+        replacements[STYLES_PART] = patcher.styles.encode('utf-8')
+    _write_package(file_path, raw, replacements)